@@ -1,8 +1,16 @@
 import pygame
+import pygame.gfxdraw
 import sys
 import random
 import math
 import colorsys
+from collections import deque
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; butterflies fall back to plain NumPy.
+    njit = None
 
 # ----------------------------------------------------
 # Global Variables & Configurations
@@ -10,6 +18,7 @@ import colorsys
 # Background & Fruit colors
 BG_COLOR = (255, 255, 255)            # initial background color (white)
 FRUIT_COLOR = (255, 0, 0)             # base fruit color (red)
+BRANCH_COLOR = (0, 0, 0)              # tree branches (black)
 
 # A few background “screens” you can cycle through:
 SCREEN_COLORS = [(255, 255, 255), (240, 240, 255), (255, 240, 240)]
@@ -22,14 +31,39 @@ FAST_TREE_SPAWN_INTERVAL = 200   # after initial tree is finished
 # Fruit growth per frame (0..1 scale)
 FRUIT_GROWTH_RATE = 0.01
 
+# Fruit color for every growth step: saturation rises from a low value (0.3)
+# to nearly full (1.0) as the fruit grows, so precompute the whole ramp once.
+FRUIT_GROWTH_STEPS = round(1 / FRUIT_GROWTH_RATE)
+_fruit_h, _fruit_l, _ = colorsys.rgb_to_hls(FRUIT_COLOR[0]/255.0, FRUIT_COLOR[1]/255.0, FRUIT_COLOR[2]/255.0)
+FRUIT_COLOR_LUT = [tuple(int(c*255) for c in colorsys.hls_to_rgb(_fruit_h, _fruit_l, 0.3 + 0.7 * (i / FRUIT_GROWTH_STEPS)))
+                   for i in range(FRUIT_GROWTH_STEPS + 1)]
+
+# Fruit outlines as offsets from the bottom–center, in units of the current fruit size.
+SHAPE_TEMPLATES = {
+    "trapezoid": ((-0.5, 0), (0.5, 0), (0.4, -0.5), (-0.4, -0.5)),
+    "diamond":   ((-0.5, 0), (0, -0.5), (0.5, 0), (0, 0.5)),
+    "triangle":  ((-0.5, 0), (0.5, 0), (0, -1)),
+}
+
+# Minimum distance (px) between fruit attachment points:
+FRUIT_SPACING = 5
+
+# Present only the changed screen areas while there are at most this many of
+# them; beyond that a full flip is cheaper.
+DIRTY_RECT_LIMIT = 25
+
 # How fast fruits are converted to butterflies:
 BUTTERFLY_TRANSFORM_INTERVAL = 100
 
 # Global lists:
 trees = []         # list of Tree objects
 fruits = []        # list of Fruit objects
-butterflies = []   # list of Butterfly objects
+growing_fruits = [] # the fruits that are still growing (the rest are drawn into the background)
+butterflies = None # ButterflySwarm (created after the classes below)
 branch_points = [] # branch endpoints (for fruit attachment)
+tree_cache_surface = None # every branch drawn so far (branches are only ever added)
+background_surface = None # background, trees and grown fruits: all that is static in states 2 and 3
+fruit_cells = {}   # grid cell -> positions of the fruits within FRUIT_SPACING of that cell
 
 # Animation state:
 # 0: Waiting to start
@@ -43,6 +77,60 @@ last_tree_spawn_time = 0
 last_fruit_spawn_time = 0
 last_butterfly_transform_time = 0
 
+# ----------------------------------------------------
+# Helper Functions
+# ----------------------------------------------------
+def get_fruit_cell(pt):
+    """Return the FRUIT_SPACING-sized grid cell containing pt."""
+    return (int(pt[0] // FRUIT_SPACING), int(pt[1] // FRUIT_SPACING))
+
+def add_fruit_position(pt):
+    """Record a fruit in its grid cell and the 8 neighbors (every cell it can block points in)."""
+    cx, cy = get_fruit_cell(pt)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            fruit_cells.setdefault((cx + dx, cy + dy), []).append(pt)
+
+def is_fruit_point_free(pt):
+    """Return True if no fruit lies within FRUIT_SPACING of pt."""
+    px, py = pt
+    limit_sq = FRUIT_SPACING * FRUIT_SPACING
+    for fx, fy in fruit_cells.get(get_fruit_cell(pt), ()):
+        dx = px - fx
+        dy = py - fy
+        if dx * dx + dy * dy < limit_sq:
+            return False
+    return True
+
+def pick_free_fruit_point():
+    """
+    Return a random branch point with no fruit within FRUIT_SPACING of it,
+    or None if there is none. Reservoir sampling picks it in one pass
+    without collecting the free points into a list.
+    """
+    chosen = None
+    free_count = 0
+    for pt in branch_points:
+        if is_fruit_point_free(pt):
+            free_count += 1
+            # Keep this point with probability 1 / free_count.
+            if random.random() * free_count < 1:
+                chosen = pt
+    return chosen
+
+def restore_background(rect):
+    """
+    Rebuild rect of background_surface from the trees and the fruits still
+    overlapping it, after a fruit has flown off as a butterfly.
+    """
+    background_surface.fill(BG_COLOR, rect)
+    background_surface.blit(tree_cache_surface, rect, rect)
+    background_surface.set_clip(rect)
+    for fruit in fruits:
+        if fruit.rect.colliderect(rect):
+            fruit.draw(background_surface)
+    background_surface.set_clip(None)
+
 # ----------------------------------------------------
 # Helper Classes
 # ----------------------------------------------------
@@ -51,102 +139,126 @@ class Branch:
     A simple branch drawn as a trapezoid.
     It stores a starting point, an angle, a length, and two widths (bottom and top).
     """
+    __slots__ = ('start', 'angle', 'length', 'bottom_width', 'top_width', 'end', 'points')
+
     def __init__(self, start, angle, length, bottom_width, top_width):
         self.start = start
         self.angle = angle
         self.length = length
         self.bottom_width = bottom_width
         self.top_width = top_width
+        # Branches never change once created, so compute the endpoint and the
+        # trapezoid corners once here instead of on every frame.
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        self.end = (start[0] + length * cos_a, start[1] + length * sin_a)
+        # Perpendicular (normal) vector:
+        nx = -sin_a
+        ny = cos_a
+        start_left  = (start[0] + nx * bottom_width/2,
+                       start[1] + ny * bottom_width/2)
+        start_right = (start[0] - nx * bottom_width/2,
+                       start[1] - ny * bottom_width/2)
+        end_left    = (self.end[0] + nx * top_width/2,
+                       self.end[1] + ny * top_width/2)
+        end_right   = (self.end[0] - nx * top_width/2,
+                       self.end[1] - ny * top_width/2)
+        self.points = (start_left, end_left, end_right, start_right)
 
     def get_full_end(self):
         """Return the endpoint of the branch."""
-        return (self.start[0] + self.length * math.cos(self.angle),
-                self.start[1] + self.length * math.sin(self.angle))
+        return self.end
 
     def draw(self, surface):
         """Draw the branch as a trapezoid."""
-        end = self.get_full_end()
-        # Compute a perpendicular (normal) vector:
-        nx = -math.sin(self.angle)
-        ny = math.cos(self.angle)
-        start_left  = (self.start[0] + nx * self.bottom_width/2,
-                       self.start[1] + ny * self.bottom_width/2)
-        start_right = (self.start[0] - nx * self.bottom_width/2,
-                       self.start[1] - ny * self.bottom_width/2)
-        end_left    = (end[0] + nx * self.top_width/2,
-                       end[1] + ny * self.top_width/2)
-        end_right   = (end[0] - nx * self.top_width/2,
-                       end[1] - ny * self.top_width/2)
-        pygame.draw.polygon(surface, (0, 0, 0),
-                            [start_left, end_left, end_right, start_right])
+        pygame.draw.polygon(surface, BRANCH_COLOR, self.points)
 
 class Tree:
     """
-    A Tree is generated recursively but built (drawn) one branch (trapezoid) per frame.
+    A Tree is generated up front but built (drawn) one branch (trapezoid) per frame.
     When a branch is a “leaf” (i.e. no children are generated), its endpoint is stored
     for later fruit attachment.
     """
     def __init__(self, base_position, initial_length, initial_width, max_depth):
         self.base_position = base_position
-        self.drawn_branches = []    # branches already drawn
-        self.pending_branches = []  # branches waiting to be added (one per frame)
+        self.pending_branches = deque()  # branches waiting to be added (one per frame)
         self.length = initial_length
         self.max_depth = max_depth
 
         # Create the trunk (grows upward from the base)
         trunk = Branch(base_position, -math.pi/2, initial_length, initial_width, initial_width * 0.3)
-        self.pending_branches.append(trunk)
-        # Recursively generate children; note: branch endpoints (leaves) are recorded.
-        self.generate_children(trunk, max_depth)
-
-    def generate_children(self, parent, depth):
-        if depth <= 0:
-            # A leaf branch – record its endpoint.
-            branch_points.append(parent.get_full_end())
-            return
-        # For a sharper, more “pointy” look use small angle offsets.
-        num_children = 2 if depth > 1 else 1
-        for i in range(num_children):
-            if num_children == 1:
-                child_angle = parent.angle + random.uniform(-0.1, 0.1)
-            else:
-                # For two children, one goes slightly left and one right.
-                if i == 0:
-                    child_angle = parent.angle - random.uniform(0.1, 0.3)
+        # Generate the trunk and its children; note: branch endpoints (leaves) are recorded.
+        leaves = self.generate_children(trunk, max_depth)
+        branch_points.extend(leaves)
+
+    def generate_children(self, trunk, max_depth):
+        """
+        Queue the trunk and all of its descendants in depth-first order and
+        return the endpoints of the leaf branches.
+        Uses an explicit stack instead of recursion and draws every random
+        number the tree needs from NumPy in a single call.
+        """
+        # A branch of depth d has two children if d > 1 and one if d == 1.
+        total = 0
+        for depth in range(1, max_depth + 1):
+            total = 2 * (1 + total) if depth > 1 else 1
+        rand = iter(np.random.random((total, 3)).tolist())
+
+        leaves = []
+        stack = [(trunk, max_depth)]
+        while stack:
+            parent, depth = stack.pop()
+            self.pending_branches.append(parent)
+            if depth <= 0:
+                # A leaf branch – record its endpoint.
+                leaves.append(parent.get_full_end())
+                continue
+            # For a sharper, more “pointy” look use small angle offsets.
+            num_children = 2 if depth > 1 else 1
+            children = []
+            for i in range(num_children):
+                u_angle, u_length, u_width = next(rand)
+                if num_children == 1:
+                    child_angle = parent.angle - 0.1 + 0.2 * u_angle
                 else:
-                    child_angle = parent.angle + random.uniform(0.1, 0.3)
-            child_length = parent.length * random.uniform(0.6, 0.8)
-            child_width = parent.top_width * random.uniform(0.6, 0.8)
-            child = Branch(parent.get_full_end(), child_angle, child_length, child_width, child_width * 0.3)
-            self.pending_branches.append(child)
-            self.generate_children(child, depth - 1)
+                    # For two children, one goes slightly left and one right.
+                    if i == 0:
+                        child_angle = parent.angle - (0.1 + 0.2 * u_angle)
+                    else:
+                        child_angle = parent.angle + (0.1 + 0.2 * u_angle)
+                child_length = parent.length * (0.6 + 0.2 * u_length)
+                child_width = parent.top_width * (0.6 + 0.2 * u_width)
+                children.append((Branch(parent.get_full_end(), child_angle, child_length, child_width, child_width * 0.3),
+                                 depth - 1))
+            # Push in reverse so the first child is popped (and drawn) first.
+            stack.extend(reversed(children))
+        return leaves
 
-    def update(self):
-        """Each frame add (draw) at most one new branch from the pending list."""
+    def update(self, surface):
+        """
+        Each frame add (draw) at most one new branch from the pending list.
+        Branches never change or disappear, so each one is drawn onto the
+        persistent forest surface exactly once.
+        """
         if self.pending_branches:
-            branch = self.pending_branches.pop(0)
-            self.drawn_branches.append(branch)
-        return len(self.pending_branches) == 0  # Returns True if tree is finished
-
-    def draw(self, surface):
-        """Draw all branches that have been added so far."""
-        for branch in self.drawn_branches:
-            branch.draw(surface)
+            self.pending_branches.popleft().draw(surface)
+        return not self.pending_branches  # Returns True if tree is finished
 
 class Fruit:
     """
     A tiny fruit that appears at a branch endpoint.
     Its shape is chosen at random and its color becomes more saturated as it grows.
     """
+    __slots__ = ('position', 'growth', 'fully_grown', 'size', 'shape', 'template', 'rect')
+
     def __init__(self, position):
         self.position = position  # bottom–center of the fruit
         self.growth = 0.0         # from 0.0 to 1.0
         self.fully_grown = False
         self.size = 8             # final size (tiny)
         self.shape = random.choice(["trapezoid", "diamond", "triangle"])
-        # Precompute the base HLS (for saturation adjustment) from FRUIT_COLOR:
-        r, g, b = FRUIT_COLOR
-        self.base_h, self.base_l, self.base_s = colorsys.rgb_to_hls(r/255.0, g/255.0, b/255.0)
+        self.template = SHAPE_TEMPLATES[self.shape]
+        self.rect = None          # screen area covered once drawn into the background
 
     def update(self):
         if not self.fully_grown:
@@ -157,80 +269,120 @@ class Fruit:
 
     def draw(self, surface):
         current_size = self.size * self.growth
-        # Increase saturation from a low value (0.3) to nearly full (1.0) as the fruit grows.
-        new_sat = 0.3 + 0.7 * self.growth
-        r, g, b = colorsys.hls_to_rgb(self.base_h, self.base_l, new_sat)
-        color = (int(r*255), int(g*255), int(b*255))
+        color = FRUIT_COLOR_LUT[round(self.growth * FRUIT_GROWTH_STEPS)]
         x, y = self.position
-        if self.shape == "trapezoid":
-            bw = current_size
-            tw = current_size * 0.8
-            h = current_size * 0.5
-            points = [(x - bw/2, y),
-                      (x + bw/2, y),
-                      (x + tw/2, y - h),
-                      (x - tw/2, y - h)]
-        elif self.shape == "diamond":
-            points = [(x - current_size/2, y),
-                      (x, y - current_size/2),
-                      (x + current_size/2, y),
-                      (x, y + current_size/2)]
-        elif self.shape == "triangle":
-            points = [(x - current_size/2, y),
-                      (x + current_size/2, y),
-                      (x, y - current_size)]
-        else:
-            points = []
-        if points:
-            pygame.draw.polygon(surface, color, points)
+        points = [(x + dx*current_size, y + dy*current_size) for dx, dy in self.template]
+        return pygame.draw.polygon(surface, color, points)
 
-class Butterfly:
+def move_butterflies(pos, vel, jitter, screen_width, screen_height):
     """
-    A tiny butterfly consisting only of two trapezoidal wings.
-    Its wings flap rapidly.
+    Per-butterfly flight step used when Numba is available: move, jitter,
+    clamp to the maximum speed and bounce off the screen edges.
     """
-    def __init__(self, position):
-        self.position = list(position)
-        self.velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
-        self.wing_flap_timer = 0.0
+    max_speed = 3.0
+    for i in range(pos.shape[0]):
+        pos[i, 0] += vel[i, 0]
+        pos[i, 1] += vel[i, 1]
+        vx = vel[i, 0] + jitter[i, 0]
+        vy = vel[i, 1] + jitter[i, 1]
+        speed_sq = vx * vx + vy * vy
+        if speed_sq > max_speed * max_speed:
+            scale = max_speed / math.sqrt(speed_sq)
+            vx *= scale
+            vy *= scale
+        if pos[i, 0] < 0 or pos[i, 0] > screen_width:
+            vx = -vx
+        if pos[i, 1] < 0 or pos[i, 1] > screen_height:
+            vy = -vy
+        vel[i, 0] = vx
+        vel[i, 1] = vy
+
+if njit is not None:
+    move_butterflies = njit(cache=True, fastmath=True)(move_butterflies)
+    # Compile now rather than on the first frame of the butterfly phase.
+    move_butterflies(np.empty((0, 2), dtype=np.float32), np.empty((0, 2), dtype=np.float32),
+                     np.empty((0, 2)), 0, 0)
+
+class ButterflySwarm:
+    """
+    All the tiny butterflies, each consisting only of two trapezoidal wings.
+    Their wings flap rapidly.
+    Positions, velocities and flap timers live in NumPy arrays (one row per
+    butterfly) so the whole swarm is moved with a handful of array operations.
+    """
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.position = np.empty((capacity, 2), dtype=np.float32)
+        self.velocity = np.empty((capacity, 2), dtype=np.float32)
+        self.wing_flap_timer = np.empty(capacity, dtype=np.float32)  # flap angle, kept in [0, 2π)
+        # Wing vertex buffer, refilled in place every frame: wings[i, side, corner] = (x, y)
+        self.wings = np.empty((capacity, 2, 4, 2), dtype=np.float32)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, position):
+        """Add a butterfly at the given position, growing the arrays when full."""
+        if self.count == len(self.position):
+            capacity = 2 * len(self.position)
+            self.position = np.resize(self.position, (capacity, 2))
+            self.velocity = np.resize(self.velocity, (capacity, 2))
+            self.wing_flap_timer = np.resize(self.wing_flap_timer, capacity)
+            self.wings = np.empty((capacity, 2, 4, 2), dtype=np.float32)
+        i = self.count
+        self.position[i] = position
+        self.velocity[i] = np.random.uniform(-2, 2, 2)
+        self.wing_flap_timer[i] = 0.0
+        self.count += 1
 
     def update(self, screen_width, screen_height):
-        self.wing_flap_timer += 0.5  # faster flapping
-        self.position[0] += self.velocity[0]
-        self.position[1] += self.velocity[1]
-        self.velocity[0] += random.uniform(-0.1, 0.1)
-        self.velocity[1] += random.uniform(-0.1, 0.1)
-        speed = math.hypot(self.velocity[0], self.velocity[1])
+        n = self.count
+        pos = self.position[:n]
+        vel = self.velocity[:n]
+        timer = self.wing_flap_timer[:n]
+        timer += 0.5  # faster flapping
+        timer %= 2 * math.pi  # same sine, without losing float32 precision over time
+        if njit is not None:
+            move_butterflies(pos, vel, np.random.uniform(-0.1, 0.1, vel.shape), screen_width, screen_height)
+            return
+        pos += vel
+        vel += np.random.uniform(-0.1, 0.1, vel.shape)
+        # Compare squared speeds so the square root is only taken for the
+        # (rare) butterflies that actually need clamping.
+        speed_sq = vel[:, 0] * vel[:, 0] + vel[:, 1] * vel[:, 1]
         max_speed = 3
-        if speed > max_speed:
-            self.velocity[0] = (self.velocity[0] / speed) * max_speed
-            self.velocity[1] = (self.velocity[1] / speed) * max_speed
-        if self.position[0] < 0 or self.position[0] > screen_width:
-            self.velocity[0] *= -1
-        if self.position[1] < 0 or self.position[1] > screen_height:
-            self.velocity[1] *= -1
+        too_fast = speed_sq > max_speed * max_speed
+        if too_fast.any():
+            vel[too_fast] *= (max_speed / np.sqrt(speed_sq[too_fast]))[:, None]
+        vel[(pos[:, 0] < 0) | (pos[:, 0] > screen_width), 0] *= -1
+        vel[(pos[:, 1] < 0) | (pos[:, 1] > screen_height), 1] *= -1
 
     def draw(self, surface):
-        x, y = self.position
+        n = self.count
         wing_size = 5  # tiny wings
-        # Compute a flap offset (in degrees)
-        flap = math.sin(self.wing_flap_timer) * 10
-        # Two simple trapezoidal wings (no body)
-        left_wing = [
-            (x, y),
-            (x - wing_size, y - wing_size/2 + flap),
-            (x - wing_size, y - wing_size + flap),
-            (x, y - wing_size/2)
-        ]
-        right_wing = [
-            (x, y),
-            (x + wing_size, y - wing_size/2 + flap),
-            (x + wing_size, y - wing_size + flap),
-            (x, y - wing_size/2)
-        ]
         wing_color = (200, 100, 200)
-        pygame.draw.polygon(surface, wing_color, left_wing)
-        pygame.draw.polygon(surface, wing_color, right_wing)
+        x = self.position[:n, 0]
+        y = self.position[:n, 1]
+        # Compute the flap offset for every butterfly at once.
+        flap = np.sin(self.wing_flap_timer[:n]) * 10
+        # Two simple trapezoidal wings (no body).
+        wings = self.wings[:n]
+        wings[:, :, 0, 0] = x[:, None]
+        wings[:, :, 3, 0] = x[:, None]
+        wings[:, 0, 1:3, 0] = (x - wing_size)[:, None]
+        wings[:, 1, 1:3, 0] = (x + wing_size)[:, None]
+        wings[:, :, 0, 1] = y[:, None]
+        wings[:, :, 1, 1] = (y - wing_size/2 + flap)[:, None]
+        wings[:, :, 2, 1] = (y - wing_size + flap)[:, None]
+        wings[:, :, 3, 1] = (y - wing_size/2)[:, None]
+        filled_polygon = pygame.gfxdraw.filled_polygon
+        for wing in wings.reshape(2 * n, 4, 2).tolist():
+            filled_polygon(surface, wing, wing_color)
+        # Return the area each butterfly covered (padded by a pixel for rounding).
+        corners = wings.reshape(n, 8, 2)
+        lo = np.floor(corners.min(axis=1)) - 1
+        size = np.ceil(corners.max(axis=1)) - lo + 2
+        return [pygame.Rect(x, y, w, h) for (x, y), (w, h) in zip(lo.tolist(), size.tolist())]
 
 # ----------------------------------------------------
 # Pygame Setup
@@ -242,19 +394,29 @@ screen_height = infoObject.current_h
 screen = pygame.display.set_mode((screen_width, screen_height), pygame.FULLSCREEN)
 pygame.display.set_caption("Simplified Tree, Fruit & Butterfly Animation")
 clock = pygame.time.Clock()
+screen_rect = screen.get_rect()
 
 # Initialize timers:
 last_tree_spawn_time = pygame.time.get_ticks()
 last_fruit_spawn_time = pygame.time.get_ticks()
 last_butterfly_transform_time = pygame.time.get_ticks()
 
+butterflies = ButterflySwarm()
+
 # ----------------------------------------------------
 # Main Loop
 # ----------------------------------------------------
+idle_drawn = False  # True once the (static) waiting screen has been shown
+dirty_rects = None  # areas drawn over the background last frame (None: repaint everything)
 running = True
 while running:
+    if state == 0 and idle_drawn:
+        # Nothing animates while waiting, so block until there is input.
+        events = [pygame.event.wait()] + pygame.event.get()
+    else:
+        events = pygame.event.get()
     current_time = pygame.time.get_ticks()
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
         elif event.type == pygame.KEYDOWN:
@@ -267,6 +429,9 @@ while running:
                     # Start with one tree growing slowly from the center-bottom.
                     center_tree = Tree((screen_width // 2, screen_height), 80, 16, 4)
                     trees.append(center_tree)
+                    tree_cache_surface = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+                    tree_cache_surface.fill((0, 0, 0, 0))
+                    background_surface = pygame.Surface((screen_width, screen_height)).convert()
                 elif state == 1:
                     state = 2
                 elif state == 2:
@@ -275,26 +440,56 @@ while running:
                 # Cycle through background screens.
                 current_screen_index = (current_screen_index + 1) % len(SCREEN_COLORS)
                 BG_COLOR = SCREEN_COLORS[current_screen_index]
+                idle_drawn = False
+                dirty_rects = None
             elif event.key == pygame.K_c:
                 # Clear the canvas (reset everything).
                 trees = []
                 fruits = []
-                butterflies = []
+                growing_fruits = []
+                fruit_cells = {}
+                butterflies = ButterflySwarm()
                 branch_points = []
+                tree_cache_surface = None
+                background_surface = None
                 state = 0
+                idle_drawn = False
+
+    if state == 0:
+        # Waiting to start: only redraw when the background has changed.
+        if running and not idle_drawn:
+            screen.fill(BG_COLOR)
+            pygame.display.flip()
+            idle_drawn = True
+        continue
 
-    # Fill background
-    screen.fill(BG_COLOR)
+    drawn_rects = []
+    changed_rects = []  # areas of the background that changed this frame
+    if state == 1:
+        # Fill background (the trees are drawn once they have grown).
+        screen.fill(BG_COLOR)
+    elif dirty_rects is None:
+        # Rebuild the background: trees plus every fruit that no longer grows.
+        background_surface.fill(BG_COLOR)
+        background_surface.blit(tree_cache_surface, (0, 0))
+        for fruit in fruits:
+            if fruit.fully_grown or state == 3:
+                fruit.rect = fruit.draw(background_surface)
+        screen.blit(background_surface, (0, 0))
+    else:
+        # The background is static: only repaint what was drawn over it last frame.
+        for rect in dirty_rects:
+            screen.blit(background_surface, rect, rect)
 
     # --------------------------
     # Animation 1: Tree Growth
     # --------------------------
     if state == 1:
         for tree in trees:
-            tree.update()   # each tree adds at most one branch per frame
-            tree.draw(screen)
+            tree.update(tree_cache_surface)   # each tree adds at most one branch per frame
+        screen.blit(tree_cache_surface, (0, 0))
         # After the initial (center) tree is finished, spawn new trees quickly.
-        if trees and trees[0].pending_branches == []:
+        if trees and not trees[0].pending_branches:
             if current_time - last_tree_spawn_time > FAST_TREE_SPAWN_INTERVAL:
                 x = random.randint(50, screen_width - 50)
                 new_tree = Tree((x, screen_height),
@@ -318,44 +513,66 @@ while running:
     # Animation 2: Fruit Growth
     # --------------------------
     elif state == 2:
-        # Draw the (completed) trees.
-        for tree in trees:
-            tree.draw(screen)
         # Every so often, plant a new fruit at an available branch point.
         if current_time - last_fruit_spawn_time > 500:
-            available_points = [pt for pt in branch_points
-                                if not any(math.hypot(pt[0] - f.position[0],
-                                                      pt[1] - f.position[1]) < 5 for f in fruits)]
-            if available_points:
-                pt = random.choice(available_points)
+            pt = pick_free_fruit_point()
+            if pt is not None:
                 new_fruit = Fruit(pt)
                 fruits.append(new_fruit)
+                growing_fruits.append(new_fruit)
+                add_fruit_position(pt)
             last_fruit_spawn_time = current_time
-        for fruit in fruits:
+        still_growing = []
+        for fruit in growing_fruits:
             fruit.update()
-            fruit.draw(screen)
+            drawn_rects.append(fruit.draw(screen))
+            if fruit.fully_grown:
+                # A grown fruit never changes: draw it into the background.
+                fruit.rect = fruit.draw(background_surface)
+            else:
+                still_growing.append(fruit)
+        growing_fruits = still_growing
 
     # --------------------------
     # Animation 3: Butterfly Flight
     # --------------------------
     elif state == 3:
-        # Draw trees and remaining fruits.a
-        for tree in trees:
-            tree.draw(screen)
-        for fruit in fruits:
+        # Fruits stop growing now, so the remaining ones become background too.
+        for fruit in growing_fruits:
+            fruit.rect = fruit.draw(background_surface)
             fruit.draw(screen)
+        growing_fruits = []
         # Gradually convert fruits into butterflies.
         if fruits and current_time - last_butterfly_transform_time > BUTTERFLY_TRANSFORM_INTERVAL:
             fruit = fruits.pop(0)
-            new_butterfly = Butterfly(fruit.position)
-            butterflies.append(new_butterfly)
+            restore_background(fruit.rect)
+            screen.blit(background_surface, fruit.rect, fruit.rect)
+            changed_rects.append(fruit.rect)
+            butterflies.spawn(fruit.position)
             last_butterfly_transform_time = current_time
-        for butterfly in butterflies:
-            butterfly.update(screen_width, screen_height)
-            butterfly.draw(screen)
+        butterflies.update(screen_width, screen_height)
+        drawn_rects.extend(butterflies.draw(screen))
 
-    pygame.display.flip()
-    clock.tick(60)
+    if state == 1 or dirty_rects is None:
+        pygame.display.flip()
+    else:
+        # Present where things were, where they are now and whatever changed
+        # in the background; with too many areas a full flip is cheaper.
+        update_rects = dirty_rects + changed_rects + drawn_rects
+        if len(update_rects) > DIRTY_RECT_LIMIT:
+            pygame.display.flip()
+        else:
+            pygame.display.update(update_rects)
+    # Clip to the screen: a restore blit whose area starts off-screen would
+    # otherwise be shifted.
+    dirty_rects = [rect.clip(screen_rect) for rect in drawn_rects] if state != 1 else None
+    # If nothing visible was drawn over the static trees this frame (no
+    # fruits, and any butterflies all off-screen), there is no need to
+    # redraw at full rate.
+    if state != 1 and screen.get_rect().collidelist(drawn_rects) == -1:
+        clock.tick(15)
+    else:
+        clock.tick(60)
 
 pygame.quit()
 sys.exit()
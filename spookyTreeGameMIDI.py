@@ -4,6 +4,8 @@ import sys
 import random
 import math
 import colorsys
+from collections import deque
+import numpy as np
 
 # ----------------------------------------------------
 # Global Variables & Configurations
@@ -12,6 +14,7 @@ import colorsys
 BG_COLOR = (12, 0, 38)
 FRUIT_COLOR = (198, 174, 255)
 BUTTERFLY_COLOR = (200, 100, 250)
+BRANCH_COLOR = (252, 250, 255)
 
 # Background screens to cycle through (not used in MIDI logic here)
 SCREEN_COLORS = [
@@ -21,6 +24,10 @@ SCREEN_COLORS = [
 ]
 current_screen_index = 0
 
+# Present only the changed screen areas while there are at most this many of
+# them; beyond that a full flip is cheaper.
+DIRTY_RECT_LIMIT = 25
+
 # Tree parameters – now trees are smaller and shorter.
 # They will spawn from any edge.
 INITIAL_BRANCH_DELAY = 130   # initial delay (ms) between branch additions
@@ -48,16 +55,33 @@ FRUIT_SIZE = 12                  # Base size (will be scaled by growth)
 FRUIT_SPAWN_INTERVAL = 1000      # Initial interval (ms) between fruit spawns
 MIN_FRUIT_SPAWN_INTERVAL = 300   # Minimum allowed spawn interval
 FRUIT_SPAWN_DECAY = 0.98         # Each spawn reduces the interval (more fruits over time)
+FRUIT_SPACING = 5                # Minimum distance (px) between fruit attachment points
+FRUIT_ANCHOR = ((FRUIT_SIZE + 2) // 2, FRUIT_SIZE + 1)  # Bottom–center of a fruit sprite
+BASE_FRUIT_HLS = colorsys.rgb_to_hls(FRUIT_COLOR[0] / 255.0, FRUIT_COLOR[1] / 255.0, FRUIT_COLOR[2] / 255.0)
+# Fruit color for each of 256 growth steps (saturation rises as the fruit grows).
+FRUIT_COLOR_LUT = [
+    tuple(int(c * 255) for c in colorsys.hls_to_rgb(BASE_FRUIT_HLS[0], BASE_FRUIT_HLS[1], 0.3 + 0.7 * i / 255))
+    for i in range(256)
+]
 
 # Butterfly parameters:
 BUTTERFLY_TRANSFORM_INTERVAL = 100  # Interval (ms) between converting a fruit to a butterfly
 BUTTERFLY_SCALE_FACTOR = 2.0          # Base butterfly size scale
+MAX_BUTTERFLIES = 300                 # Beyond this, new butterflies replace the oldest ones
+MAX_FRUITS = 500                      # No new fruits spawn while this many exist
+MAX_BRANCH_POINTS = 5000              # Only the most recent branch endpoints are kept
 
 # Global containers:
 trees = []         # List of Tree objects
-fruits = []        # List of Fruit objects
-butterflies = []   # List of Butterfly objects
-branch_points = [] # Recorded branch endpoints (for fruit attachment)
+growing_fruits = [] # Fruit objects still growing
+grown_fruits = []   # Fully grown Fruit objects (no longer updated)
+butterflies = None # ButterflySwarm (created after the classes below)
+branch_points = deque(maxlen=MAX_BRANCH_POINTS)  # Recent branch endpoints (for fruit attachment)
+forest_surface = None # Screen-sized: background plus every branch drawn so far
+background_surface = None # forest_surface plus every grown fruit (all that is static)
+fruit_cells = {}   # Grid cell -> positions of the fruits within FRUIT_SPACING of that cell
+fruit_sprites = {} # (parts, growth step) -> pre-rendered fruit Surface
+wing_sprites = {}  # (wing size, flap offset) in whole pixels -> (wing Surface, anchor)
 
 # Animation state:
 # 0: Waiting to start
@@ -66,6 +90,9 @@ branch_points = [] # Recorded branch endpoints (for fruit attachment)
 # 3: Animation 3 – Butterfly flight (trees keep growing, but slower)
 state = 0
 
+# Shared NumPy random generator for the per-frame batched draws.
+rng = np.random.default_rng()
+
 last_tree_spawn_time = 0
 last_fruit_spawn_time = 0
 last_butterfly_transform_time = 0
@@ -91,6 +118,68 @@ def get_random_tree_spawn():
         angle = math.pi + angle_offset     # grow leftward
     return pos, angle
 
+def get_fruit_cell(pt):
+    """Return the FRUIT_SPACING-sized grid cell containing pt."""
+    return (int(pt[0] // FRUIT_SPACING), int(pt[1] // FRUIT_SPACING))
+
+def add_fruit_position(pt):
+    """Record a fruit in its grid cell and the 8 neighbors (every cell it can block points in)."""
+    cx, cy = get_fruit_cell(pt)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            fruit_cells.setdefault((cx + dx, cy + dy), []).append(pt)
+
+def is_fruit_point_free(pt):
+    """Return True if no fruit lies within FRUIT_SPACING of pt."""
+    px, py = pt
+    limit_sq = FRUIT_SPACING * FRUIT_SPACING
+    for fx, fy in fruit_cells.get(get_fruit_cell(pt), ()):
+        dx = px - fx
+        dy = py - fy
+        if dx * dx + dy * dy < limit_sq:
+            return False
+    return True
+
+def restore_background(rect):
+    """
+    Rebuild rect of background_surface from the forest and the grown fruits
+    overlapping it, after a branch has been added or a fruit has left.
+    """
+    background_surface.blit(forest_surface, rect, rect)
+    background_surface.set_clip(rect)
+    background_surface.blits([fruit.get_blit() for fruit in grown_fruits if fruit.rect.colliderect(rect)],
+                             doreturn=False)
+    background_surface.set_clip(None)
+
+def get_wing_sprite(wing_size, flap):
+    """
+    Return (surface, anchor) for a pair of wings of the given size and flap
+    offset (whole pixels), drawing it the first time it is needed.
+    The anchor is where the butterfly's position falls on the surface.
+    """
+    key = (wing_size, flap)
+    sprite = wing_sprites.get(key)
+    if sprite is None:
+        # Wings span x in [-wing_size, wing_size] and y in [-wing_size - 10, 10].
+        surface = pygame.Surface((2 * wing_size + 3, wing_size + 23), pygame.SRCALPHA).convert_alpha()
+        x, y = anchor = (wing_size + 1, wing_size + 11)
+        left_wing = [
+            (x, y),
+            (x - wing_size, y - wing_size/2 + flap),
+            (x - wing_size, y - wing_size + flap),
+            (x, y - wing_size/2)
+        ]
+        right_wing = [
+            (x, y),
+            (x + wing_size, y - wing_size/2 + flap),
+            (x + wing_size, y - wing_size + flap),
+            (x, y - wing_size/2)
+        ]
+        pygame.draw.polygon(surface, BUTTERFLY_COLOR, left_wing)
+        pygame.draw.polygon(surface, BUTTERFLY_COLOR, right_wing)
+        sprite = wing_sprites[key] = (surface, anchor)
+    return sprite
+
 # ----------------------------------------------------
 # Classes
 # ----------------------------------------------------
@@ -104,80 +193,99 @@ class Branch:
         self.length = length
         self.bottom_width = bottom_width
         self.top_width = top_width
+        # Branches never change, so do the trig and corner math once.
+        self._cos = math.cos(angle)
+        self._sin = math.sin(angle)
+        self._end = (start[0] + length * self._cos,
+                     start[1] + length * self._sin)
+        # Compute perpendicular vector for thickness:
+        nx = -self._sin
+        ny = self._cos
+        start_left  = (start[0] + nx * bottom_width / 2,
+                       start[1] + ny * bottom_width / 2)
+        start_right = (start[0] - nx * bottom_width / 2,
+                       start[1] - ny * bottom_width / 2)
+        end_left    = (self._end[0] + nx * top_width / 2,
+                       self._end[1] + ny * top_width / 2)
+        end_right   = (self._end[0] - nx * top_width / 2,
+                       self._end[1] - ny * top_width / 2)
+        self._verts = (start_left, end_left, end_right, start_right)
 
     def get_full_end(self):
-        return (self.start[0] + self.length * math.cos(self.angle),
-                self.start[1] + self.length * math.sin(self.angle))
+        return self._end
+
+    def get_polygon(self):
+        return self._verts
 
     def draw(self, surface):
-        end = self.get_full_end()
-        # Compute perpendicular vector for thickness:
-        nx = -math.sin(self.angle)
-        ny = math.cos(self.angle)
-        start_left  = (self.start[0] + nx * self.bottom_width / 2,
-                       self.start[1] + ny * self.bottom_width / 2)
-        start_right = (self.start[0] - nx * self.bottom_width / 2,
-                       self.start[1] - ny * self.bottom_width / 2)
-        end_left    = (end[0] + nx * self.top_width / 2,
-                       end[1] + ny * self.top_width / 2)
-        end_right   = (end[0] - nx * self.top_width / 2,
-                       end[1] - ny * self.top_width / 2)
-        pygame.draw.polygon(surface, (252, 250, 255),
-                            [start_left, end_left, end_right, start_right])
+        return pygame.draw.polygon(surface, BRANCH_COLOR, self.get_polygon())
 
 class Tree:
     """
     A tree grows by adding one branch at a time.
     The trunk is created using the given initial angle.
+    Each branch is drawn once, as it is added, onto the shared forest surface.
     """
     def __init__(self, base_position, initial_angle, length, width, max_depth, branch_delay=INITIAL_BRANCH_DELAY):
         self.base_position = base_position
         self.initial_angle = initial_angle
-        self.pending_branches = []  # Branches waiting to be added
-        self.drawn_branches = []    # Branches already drawn
+        self.pending_branches = deque()  # Branches waiting to be added
         self.max_depth = max_depth
         self.branch_growth_delay = branch_delay
         self.last_branch_growth_time = pygame.time.get_ticks()
         # Create the trunk.
         trunk = Branch(base_position, initial_angle, length, width, width * 0.8)
-        self.pending_branches.append(trunk)
         self.generate_children(trunk, max_depth)
 
-    def generate_children(self, parent, depth):
-        if depth <= 0:
-            branch_points.append(parent.get_full_end())
-            return
-        if depth > 1:
-            # Two children with very chaotic angle offsets.
-            left_offset = random.uniform(-1.5, -0.2)
-            right_offset = random.uniform(0.2, 1.5)
-            for angle in [parent.angle + left_offset, parent.angle + right_offset]:
-                child_length = parent.length * random.uniform(0.6, 0.9)
-                child_width = parent.top_width * random.uniform(0.6, 0.9)
-                child = Branch(parent.get_full_end(), angle, child_length, child_width, child_width * 0.8)
-                self.pending_branches.append(child)
-                self.generate_children(child, depth - 1)
-        else:
-            # Single child with a very random offset.
-            child_angle = parent.angle + random.uniform(-1.0, 1.0)
-            child_length = parent.length * random.uniform(0.6, 0.9)
-            child_width = parent.top_width * random.uniform(0.6, 0.9)
-            child = Branch(parent.get_full_end(), child_angle, child_length, child_width, child_width * 0.8)
-            self.pending_branches.append(child)
-            self.generate_children(child, depth - 1)
-
-    def update(self, current_time, speed_factor=1.0):
+    def generate_children(self, trunk, depth):
+        """
+        Queue trunk and all of its descendants in pending_branches, depth
+        first, recording the endpoint of every last branch in branch_points.
+        """
+        # Branches more than one level above the tips get two children and
+        # those one level above get one: 3 * 2**(depth-1) - 2 children in all,
+        # each drawing an angle, a length and a width.
+        count = 3 * 2 ** (depth - 1) - 2 if depth > 0 else 0
+        draws = iter(rng.random((count, 3)).tolist())
+        stack = [(trunk, depth)]
+        while stack:
+            parent, depth = stack.pop()
+            self.pending_branches.append(parent)
+            parent_end = parent.get_full_end()
+            if depth <= 0:
+                branch_points.append(parent_end)
+                continue
+            if depth > 1:
+                # Two children with very chaotic angle offsets.
+                angle_ranges = ((-1.5, -0.2), (0.2, 1.5))
+            else:
+                # Single child with a very random offset.
+                angle_ranges = ((-1.0, 1.0),)
+            children = []
+            for low, high in angle_ranges:
+                u_angle, u_length, u_width = next(draws)
+                child_angle = parent.angle + low + (high - low) * u_angle
+                child_length = parent.length * (0.6 + 0.3 * u_length)
+                child_width = parent.top_width * (0.6 + 0.3 * u_width)
+                child = Branch(parent_end, child_angle, child_length, child_width, child_width * 0.8)
+                children.append((child, depth - 1))
+            # Reversed, so the first child's subtree is queued first.
+            stack.extend(reversed(children))
+
+    def update(self, current_time, speed_factor=1.0, dirty_rects=None):
+        """
+        Add the next branch once its delay has passed. The screen area of a
+        newly drawn branch is appended to dirty_rects, if given.
+        """
         effective_delay = self.branch_growth_delay / speed_factor
         if self.pending_branches and (current_time - self.last_branch_growth_time >= effective_delay):
-            branch = self.pending_branches.pop(0)
-            self.drawn_branches.append(branch)
+            branch = self.pending_branches.popleft()
+            rect = branch.draw(forest_surface)
+            if dirty_rects is not None:
+                dirty_rects.append(rect)
             self.last_branch_growth_time = current_time
             self.branch_growth_delay = max(self.branch_growth_delay * DELAY_DECAY_FACTOR, MIN_BRANCH_DELAY)
-        return len(self.pending_branches) == 0
-
-    def draw(self, surface):
-        for branch in self.drawn_branches:
-            branch.draw(surface)
+        return not self.pending_branches
 
 class Fruit:
     """
@@ -190,8 +298,10 @@ class Fruit:
         self.fully_grown = False
         self.size = FRUIT_SIZE
         self.parts = random.choice([2, 3])  # Number of stacked trapezoids.
-        r, g, b = FRUIT_COLOR
-        self.base_h, self.base_l, self.base_s = colorsys.rgb_to_hls(r/255.0, g/255.0, b/255.0)
+        # Screen area of the sprite (its size is fixed; only the drawing grows).
+        x, y = position
+        self.rect = pygame.Rect(round(x - FRUIT_ANCHOR[0]), round(y - FRUIT_ANCHOR[1]),
+                                FRUIT_SIZE + 2, FRUIT_SIZE + 2)
 
     def update(self):
         if not self.fully_grown:
@@ -200,72 +310,112 @@ class Fruit:
                 self.growth = 1.0
                 self.fully_grown = True
 
+    def get_sprite(self, step):
+        """
+        Return the fruit drawn at the given growth step (0-255) on a small
+        transparent surface, with its bottom–center at FRUIT_ANCHOR.
+        Sprites are shared by every fruit with the same number of parts.
+        """
+        key = (self.parts, step)
+        sprite = fruit_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((FRUIT_SIZE + 2, FRUIT_SIZE + 2), pygame.SRCALPHA).convert_alpha()
+            color = FRUIT_COLOR_LUT[step]
+            current_size = self.size * step / 255
+            x, y = FRUIT_ANCHOR
+            num_parts = self.parts
+            part_height = current_size / num_parts
+            for i in range(num_parts):
+                bottom_width = current_size * (1 - 0.1 * i)
+                top_width = current_size * (1 - 0.1 * (i + 1))
+                y_bottom = y - i * part_height
+                y_top = y - (i + 1) * part_height
+                points = [
+                    (x - bottom_width/2, y_bottom),
+                    (x + bottom_width/2, y_bottom),
+                    (x + top_width/2, y_top),
+                    (x - top_width/2, y_top)
+                ]
+                pygame.draw.polygon(sprite, color, points)
+            fruit_sprites[key] = sprite
+        return sprite
+
+    def get_blit(self):
+        """Return the (sprite, rect) pair that draws the fruit, for Surface.blits."""
+        return self.get_sprite(int(self.growth * 255)), self.rect
+
     def draw(self, surface):
-        current_size = self.size * self.growth
-        new_sat = 0.3 + 0.7 * self.growth
-        r, g, b = colorsys.hls_to_rgb(self.base_h, self.base_l, new_sat)
-        color = (int(r * 255), int(g * 255), int(b * 255))
-        x, y = self.position
-        num_parts = self.parts
-        part_height = current_size / num_parts
-        for i in range(num_parts):
-            bottom_width = current_size * (1 - 0.1 * i)
-            top_width = current_size * (1 - 0.1 * (i + 1))
-            y_bottom = y - i * part_height
-            y_top = y - (i + 1) * part_height
-            points = [
-                (x - bottom_width/2, y_bottom),
-                (x + bottom_width/2, y_bottom),
-                (x + top_width/2, y_top),
-                (x - top_width/2, y_top)
-            ]
-            pygame.draw.polygon(surface, color, points)
-
-class Butterfly:
+        return surface.blit(*self.get_blit())
+
+class ButterflySwarm:
     """
-    A butterfly made of two trapezoidal wings.
-    Its wings flap rapidly.
+    All the butterflies, each made of two trapezoidal wings.
+    Their wings flap rapidly.
+    Butterfly state lives in NumPy arrays (one row per butterfly) so the
+    whole swarm is moved with a few vectorized operations per frame.
     """
-    def __init__(self, position):
-        self.position = list(position)
-        self.velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
-        self.wing_flap_timer = 0.0
-        self.scale = BUTTERFLY_SCALE_FACTOR * random.uniform(0.8, 1.2)
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.oldest = 0  # Row recycled next once MAX_BUTTERFLIES is reached
+        self.pos = np.empty((capacity, 2), dtype=np.float32)
+        self.vel = np.empty((capacity, 2), dtype=np.float32)
+        self.wing_timer = np.empty(capacity, dtype=np.float32)
+        self.scale = np.empty(capacity, dtype=np.float32)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, position):
+        """
+        Add a butterfly at position, growing the arrays when they are full.
+        Once MAX_BUTTERFLIES exist, the oldest butterfly's row is reused.
+        """
+        if self.count == MAX_BUTTERFLIES:
+            i = self.oldest
+            self.oldest = (i + 1) % MAX_BUTTERFLIES
+        else:
+            if self.count == len(self.pos):
+                self.grow()
+            i = self.count
+            self.count += 1
+        self.pos[i] = position
+        self.vel[i] = (random.uniform(-2, 2), random.uniform(-2, 2))
+        self.wing_timer[i] = 0.0
+        self.scale[i] = BUTTERFLY_SCALE_FACTOR * random.uniform(0.8, 1.2)
+
+    def grow(self):
+        """Double the array capacity, up to MAX_BUTTERFLIES rows."""
+        capacity = min(2 * len(self.pos), MAX_BUTTERFLIES)
+        self.pos = np.resize(self.pos, (capacity, 2))
+        self.vel = np.resize(self.vel, (capacity, 2))
+        self.wing_timer = np.resize(self.wing_timer, capacity)
+        self.scale = np.resize(self.scale, capacity)
 
     def update(self, screen_width, screen_height):
-        self.wing_flap_timer += 1.0
-        self.position[0] += self.velocity[0]
-        self.position[1] += self.velocity[1]
-        self.velocity[0] += random.uniform(-0.1, 0.1)
-        self.velocity[1] += random.uniform(-0.1, 0.1)
-        speed = math.hypot(self.velocity[0], self.velocity[1])
+        n = self.count
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        self.wing_timer[:n] += 1.0
+        pos += vel
+        vel += rng.uniform(-0.1, 0.1, vel.shape)
+        speed = np.hypot(vel[:, 0], vel[:, 1])
         max_speed = 3
-        if speed > max_speed:
-            self.velocity[0] = (self.velocity[0] / speed) * max_speed
-            self.velocity[1] = (self.velocity[1] / speed) * max_speed
-        if self.position[0] < 0 or self.position[0] > screen_width:
-            self.velocity[0] *= -1
-        if self.position[1] < 0 or self.position[1] > screen_height:
-            self.velocity[1] *= -1
+        mask = speed > max_speed
+        vel[mask] *= (max_speed / speed[mask])[:, None]
+        vel[:, 0] = np.where((pos[:, 0] < 0) | (pos[:, 0] > screen_width), -vel[:, 0], vel[:, 0])
+        vel[:, 1] = np.where((pos[:, 1] < 0) | (pos[:, 1] > screen_height), -vel[:, 1], vel[:, 1])
 
     def draw(self, surface):
-        x, y = self.position
-        wing_size = 4 * self.scale
-        flap = math.sin(self.wing_flap_timer) * 10
-        left_wing = [
-            (x, y),
-            (x - wing_size, y - wing_size/2 + flap),
-            (x - wing_size, y - wing_size + flap),
-            (x, y - wing_size/2)
-        ]
-        right_wing = [
-            (x, y),
-            (x + wing_size, y - wing_size/2 + flap),
-            (x + wing_size, y - wing_size + flap),
-            (x, y - wing_size/2)
-        ]
-        pygame.draw.polygon(surface, BUTTERFLY_COLOR, left_wing)
-        pygame.draw.polygon(surface, BUTTERFLY_COLOR, right_wing)
+        """Blit every butterfly's wings in one call; return the areas covered."""
+        n = self.count
+        wing_sizes = np.rint(4 * self.scale[:n]).astype(int)
+        flaps = np.rint(np.sin(self.wing_timer[:n]) * 10).astype(int)
+        positions = np.rint(self.pos[:n]).astype(int)
+        blit_list = []
+        for (x, y), wing_size, flap in zip(positions.tolist(), wing_sizes.tolist(), flaps.tolist()):
+            sprite, (ax, ay) = get_wing_sprite(wing_size, flap)
+            blit_list.append((sprite, (x - ax, y - ay)))
+        return surface.blits(blit_list)
 
 # ----------------------------------------------------
 # Pygame and MIDI Setup
@@ -282,17 +432,25 @@ screen_height = infoObject.current_h
 screen = pygame.display.set_mode((screen_width, screen_height), pygame.FULLSCREEN)
 pygame.display.set_caption("Trippy, Spooky, Chaotic Trees, Fruits & Butterflies")
 clock = pygame.time.Clock()
+forest_surface = pygame.Surface((screen_width, screen_height)).convert()
+forest_surface.fill(BG_COLOR)
+background_surface = forest_surface.copy()
 
 last_tree_spawn_time = pygame.time.get_ticks()
 last_fruit_spawn_time = pygame.time.get_ticks()
 last_butterfly_transform_time = pygame.time.get_ticks()
 
+butterflies = ButterflySwarm()
+
 # ----------------------------------------------------
 # Main Loop (MIDI CC-Based State Transitions)
 # ----------------------------------------------------
+full_redraw = True  # Present the whole screen on the next frame
+dirty_rects = []    # Areas of moving things drawn on the previous frame
 running = True
 while running:
     current_time = pygame.time.get_ticks()
+    drawn_rects = []
     
     # Process standard Pygame events (only ESC to quit)
     for event in pygame.event.get():
@@ -302,13 +460,13 @@ while running:
             if event.key == pygame.K_ESCAPE:
                 running = False
 
-    # Process MIDI events.
+    # Process MIDI events: drain everything queued so a burst of controller
+    # traffic cannot back up, but act on at most one state change per frame.
     if midi_input.poll():
-        midi_events = midi_input.read(10)  # Read up to 10 events
+        midi_events = midi_input.read(1024)
         for event in midi_events:
             data = event[0]  # Data format: [status, cc_number, cc_value, _]
             status, cc_number, cc_value, _ = data
-            print("MIDI Event - Status: {}, CC#: {}, Value: {}".format(status, cc_number, cc_value))
             # Check for a Control Change message (masking the lower 4 bits) on any channel.
             if (status & 0xF0) == 176 and cc_number == 18 and cc_value > 64:
                 # Use CC 18 to cycle through states.
@@ -325,8 +483,21 @@ while running:
                     state = 3
                     print("Switching to state 3: Butterfly flight.")
                 # (Once in state 3, further CC events on 18 do not change the state.)
-
-    screen.fill(BG_COLOR)
+                break
+
+    # Nothing moves while waiting: once the blank screen has been presented,
+    # skip rendering and just keep polling at the frame rate.
+    if state == 0 and not full_redraw:
+        clock.tick(60)
+        continue
+
+    # Only growing fruits and butterflies move: erase last frame's by
+    # restoring the static background underneath them.
+    if full_redraw:
+        screen.blit(background_surface, (0, 0))
+    else:
+        screen.blits([(background_surface, rect, rect) for rect in dirty_rects], doreturn=False)
+    changed_rects = []  # Areas of the background that changed this frame
 
     # ----------------------------------------------------
     # Animation Logic
@@ -334,9 +505,8 @@ while running:
     if state == 1:
         # Animation 1: Fast tree growth.
         for tree in trees:
-            tree.update(current_time, speed_factor=TREE_SPEED_ANIM1)
-            tree.draw(screen)
-        if trees and len(trees[0].pending_branches) == 0:
+            tree.update(current_time, speed_factor=TREE_SPEED_ANIM1, dirty_rects=changed_rects)
+        if trees and not trees[0].pending_branches:
             if current_time - last_tree_spawn_time > TREE_SPAWN_INTERVAL_PHASE1:
                 pos, angle = get_random_tree_spawn()
                 length, width, max_depth = get_random_tree_params()
@@ -347,8 +517,7 @@ while running:
         # In animations 2 & 3, trees continue growing, but slower.
         speed = TREE_SPEED_ANIM2 if state == 2 else TREE_SPEED_ANIM3
         for tree in trees:
-            tree.update(current_time, speed_factor=speed)
-            tree.draw(screen)
+            tree.update(current_time, speed_factor=speed, dirty_rects=changed_rects)
         if current_time - last_tree_spawn_time > TREE_SPAWN_INTERVAL_PHASE23:
             pos, angle = get_random_tree_spawn()
             length, width, max_depth = get_random_tree_params()
@@ -356,36 +525,68 @@ while running:
             trees.append(new_tree)
             last_tree_spawn_time = current_time
 
-        if state == 2:
-            # Fruit growth phase.
-            if current_time - last_fruit_spawn_time > FRUIT_SPAWN_INTERVAL:
-                available_points = [pt for pt in branch_points
-                                    if not any(math.hypot(pt[0] - f.position[0],
-                                                          pt[1] - f.position[1]) < 5 for f in fruits)]
-                if available_points:
-                    pt = random.choice(available_points)
-                    new_fruit = Fruit(pt)
-                    fruits.append(new_fruit)
-                    FRUIT_SPAWN_INTERVAL = max(MIN_FRUIT_SPAWN_INTERVAL, FRUIT_SPAWN_INTERVAL * FRUIT_SPAWN_DECAY)
-                last_fruit_spawn_time = current_time
-            for fruit in fruits:
-                fruit.update()
-                fruit.draw(screen)
-        elif state == 3:
-            # Butterfly flight phase.
-            for fruit in fruits:
-                fruit.draw(screen)
-            if fruits and current_time - last_butterfly_transform_time > BUTTERFLY_TRANSFORM_INTERVAL:
-                fruit = fruits.pop(0)
-                new_butterfly = Butterfly(fruit.position)
-                butterflies.append(new_butterfly)
-                last_butterfly_transform_time = current_time
-            for butterfly in butterflies:
-                butterfly.update(screen_width, screen_height)
-                butterfly.draw(screen)
-
-    pygame.display.flip()
-    clock.tick(60)
+    # New branches go underneath the grown fruits.
+    for rect in changed_rects:
+        restore_background(rect)
+    screen.blits([(background_surface, rect, rect) for rect in changed_rects], doreturn=False)
+
+    if state == 2:
+        # Fruit growth phase.
+        if (current_time - last_fruit_spawn_time > FRUIT_SPAWN_INTERVAL
+                and len(growing_fruits) + len(grown_fruits) < MAX_FRUITS):
+            available_points = [pt for pt in branch_points if is_fruit_point_free(pt)]
+            if available_points:
+                pt = random.choice(available_points)
+                new_fruit = Fruit(pt)
+                growing_fruits.append(new_fruit)
+                add_fruit_position(pt)
+                FRUIT_SPAWN_INTERVAL = max(MIN_FRUIT_SPAWN_INTERVAL, FRUIT_SPAWN_INTERVAL * FRUIT_SPAWN_DECAY)
+            last_fruit_spawn_time = current_time
+        still_growing = []
+        blit_list = []
+        for fruit in growing_fruits:
+            fruit.update()
+            blit_list.append(fruit.get_blit())
+            if fruit.fully_grown:
+                # Grown fruits never change, so they become part of the background.
+                fruit.draw(background_surface)
+                grown_fruits.append(fruit)
+            else:
+                still_growing.append(fruit)
+        growing_fruits = still_growing
+        drawn_rects.extend(screen.blits(blit_list))
+    elif state == 3:
+        # Butterfly flight phase.
+        # Fruits stop growing in this phase, so they all become background.
+        for fruit in growing_fruits:
+            fruit.draw(background_surface)
+            fruit.draw(screen)
+        grown_fruits.extend(growing_fruits)
+        growing_fruits = []
+        if grown_fruits and current_time - last_butterfly_transform_time > BUTTERFLY_TRANSFORM_INTERVAL:
+            fruit = grown_fruits.pop(0)
+            # Clip to the screen: a copy whose area starts off-screen would be shifted.
+            rect = fruit.rect.clip(screen.get_rect())
+            restore_background(rect)
+            screen.blit(background_surface, rect, rect)
+            changed_rects.append(rect)
+            butterflies.spawn(fruit.position)
+            last_butterfly_transform_time = current_time
+        butterflies.update(screen_width, screen_height)
+        drawn_rects.extend(butterflies.draw(screen))
+
+    # Present where moving things were, where they are now and whatever
+    # changed in the background.
+    update_rects = dirty_rects + changed_rects + drawn_rects
+    if full_redraw or len(update_rects) > DIRTY_RECT_LIMIT:
+        pygame.display.flip()
+        full_redraw = False
+    elif update_rects:
+        pygame.display.update(update_rects)
+    dirty_rects = drawn_rects
+    # Busy-wait the tail of the frame so pacing (and the next MIDI poll)
+    # is not delayed by coarse OS sleep granularity.
+    clock.tick_busy_loop(60)
 
 # Cleanup: close MIDI input and quit.
 midi_input.close()